@@ -0,0 +1,81 @@
+"""
+FastAPI dependency providers for shared, startup-initialized resources.
+
+Providers are ``async def`` so FastAPI awaits them on the event loop instead
+of dispatching each lookup to its threadpool.
+"""
+
+from typing import Awaitable, Callable, Optional
+
+import numpy as np
+from fastapi import Depends, Request
+
+from app.core.ann_sync import ReplicatedANNIndex
+from app.core.background import BackgroundWorker
+from app.core.batching import MicroBatcher
+from app.core.prefilter import PatternPrefilter
+from app.core.runtime_config import RuntimeSettings
+from app.services.embed_service import EmbedService
+from app.services.moderation_service import ModerationService
+from app.services.recommend_service import RecommendService
+
+
+def require_model(name: str):
+    """Route dependency that loads model ``name`` before the handler runs."""
+
+    async def load_model(request: Request) -> None:
+        await request.app.state.models[name].get()
+
+    return Depends(load_model)
+
+
+async def get_shared_cache(request: Request):
+    """Shared Redis cache client."""
+    return request.app.state.cache
+
+
+async def get_app_runtime_settings(request: Request) -> RuntimeSettings:
+    """RuntimeSettings the app was started with."""
+    return request.app.state.runtime_settings
+
+
+async def get_prefilter(request: Request) -> PatternPrefilter:
+    """Shared moderation pattern pre-filter."""
+    return request.app.state.prefilter
+
+
+async def get_moderation_batcher(request: Request) -> Optional[MicroBatcher]:
+    """Micro-batcher for single moderation calls, or None when unbatched."""
+    return request.app.state.moderation_batcher
+
+
+async def get_query_embedder(
+    request: Request,
+) -> Callable[[str], Awaitable[np.ndarray]]:
+    """Cached (and, where supported, batched) search query encoder."""
+    return request.app.state.query_embedder
+
+
+async def get_ann_index(request: Request) -> ReplicatedANNIndex:
+    """This worker's replicated ANN index over listing embeddings."""
+    return request.app.state.ann_index
+
+
+async def get_background_worker(request: Request) -> BackgroundWorker:
+    """Shared worker for jobs that run off the request path."""
+    return request.app.state.background_worker
+
+
+async def get_moderation_service(request: Request) -> ModerationService:
+    """Shared moderation service."""
+    return request.app.state.moderation_service
+
+
+async def get_recommend_service(request: Request) -> RecommendService:
+    """Shared recommendation service."""
+    return request.app.state.recommend_service
+
+
+async def get_embed_service(request: Request) -> EmbedService:
+    """Shared embedding/search service."""
+    return request.app.state.embed_service
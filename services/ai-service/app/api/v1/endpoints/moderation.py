@@ -1,22 +1,101 @@
-from fastapi import APIRouter, HTTPException, Request
-from typing import Dict, Any
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Response
+)
+from fastapi.responses import ORJSONResponse
+from typing import Dict, Any, List, Optional
+import asyncio
 import logging
 
+import orjson
+
 from app.schemas.moderation import (
     ModerationRequest,
     ModerationResult,
     ModerationResponse
 )
+from app.api.deps import (
+    get_app_runtime_settings,
+    get_moderation_batcher,
+    get_moderation_service,
+    get_prefilter,
+    require_model
+)
+from app.core.batching import MicroBatcher
+from app.core.prefilter import PatternPrefilter
+from app.core.runtime_config import RuntimeSettings
 from app.services.moderation_service import ModerationService
-from app.core.database import get_database
+
+# Batches larger than this are serialized off the event loop
+BATCH_SERIALIZE_THREAD_THRESHOLD = 1000
+
+# Reported as the model version for texts rejected by the pattern pre-filter
+PREFILTER_MODEL_VERSION = "prefilter-v1"
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.post("/listing", response_model=ModerationResponse)
+
+def _encode_batch_response(
+    total_processed: int,
+    flagged_count: int,
+    batch_results: List[Any],
+) -> bytes:
+    """Encode the /batch response body straight to JSON bytes."""
+    return orjson.dumps({
+        "success": True,
+        "total_processed": total_processed,
+        "flagged_count": flagged_count,
+        "results": [
+            {
+                "content_id": result.content_id,
+                "is_flagged": result.is_flagged,
+                "confidence_score": result.confidence_score,
+                "flagged_categories": result.flagged_categories,
+                "recommended_action": result.recommended_action
+            }
+            for result in batch_results
+        ]
+    })
+
+
+def _prefilter_result(
+    prefilter: PatternPrefilter,
+    content_id: Any,
+    text: str,
+) -> Optional[ModerationResult]:
+    """Flag text matching a banned pattern without running the model."""
+    categories = prefilter.scan(text)
+    if not categories:
+        return None
+    return ModerationResult(
+        content_id=content_id,
+        is_flagged=True,
+        confidence_score=1.0,
+        flagged_categories=categories,
+        severity_level="high",
+        recommended_action="reject",
+        explanation=f"Matched blocked patterns: {', '.join(categories)}",
+        model_version=PREFILTER_MODEL_VERSION
+    )
+
+
+@router.post(
+    "/listing",
+    response_model=ModerationResponse,
+    dependencies=[require_model("moderation")]
+)
 async def moderate_listing(
     moderation_request: ModerationRequest,
-    request: Request = None,
+    background_tasks: BackgroundTasks,
+    moderation_service: ModerationService = Depends(get_moderation_service),
+    prefilter: PatternPrefilter = Depends(get_prefilter),
+    moderation_batcher: Optional[MicroBatcher] = Depends(
+        get_moderation_batcher
+    ),
 ) -> ModerationResponse:
     """
     Analyze a listing's text for inappropriate content.
@@ -28,24 +107,38 @@ async def moderate_listing(
     - Policy violations
     """
     try:
-        # Get model manager from app state
-        model_manager = request.app.state.model_manager
-        moderation_service = ModerationService(model_manager, get_database())
-        
-        # Perform moderation analysis
-        moderation_result = await moderation_service.moderate_content(
-            content_id=moderation_request.listing_id,
-            content_type="listing",
-            text=moderation_request.text,
-            additional_context={
-                "title": moderation_request.additional_context.get("title", ""),
-                "category": moderation_request.additional_context.get("category", ""),
-                "price": moderation_request.additional_context.get("price", 0)
-            }
+        # Run the pattern pre-filter first; the model only sees texts it passes
+        moderation_result = _prefilter_result(
+            prefilter,
+            moderation_request.listing_id,
+            moderation_request.text
         )
         
-        # Log moderation action
-        await moderation_service.log_moderation_action(
+        # Perform moderation analysis, batched with concurrent listing
+        # requests when the service supports batched moderate_content calls
+        if moderation_result is None:
+            moderation_kwargs = dict(
+                content_id=moderation_request.listing_id,
+                content_type="listing",
+                text=moderation_request.text,
+                additional_context={
+                    "title": moderation_request.additional_context.get("title", ""),
+                    "category": moderation_request.additional_context.get("category", ""),
+                    "price": moderation_request.additional_context.get("price", 0)
+                }
+            )
+            if moderation_batcher is not None:
+                moderation_result = await moderation_batcher.submit(
+                    moderation_kwargs
+                )
+            else:
+                moderation_result = await moderation_service.moderate_content(
+                    **moderation_kwargs
+                )
+        
+        # Log moderation action after the response is sent
+        background_tasks.add_task(
+            moderation_service.log_moderation_action,
             content_id=moderation_request.listing_id,
             content_type="listing",
             moderation_result=moderation_result
@@ -70,10 +163,16 @@ async def moderate_listing(
             detail=f"Content moderation failed: {str(e)}"
         )
 
-@router.post("/review", response_model=ModerationResponse)
+@router.post(
+    "/review",
+    response_model=ModerationResponse,
+    dependencies=[require_model("moderation")]
+)
 async def moderate_review(
     moderation_request: ModerationRequest,
-    request: Request = None,
+    background_tasks: BackgroundTasks,
+    moderation_service: ModerationService = Depends(get_moderation_service),
+    prefilter: PatternPrefilter = Depends(get_prefilter),
 ) -> ModerationResponse:
     """
     Analyze a user review for inappropriate content.
@@ -82,24 +181,29 @@ async def moderate_review(
     and rules specific to user-generated reviews and ratings.
     """
     try:
-        # Get model manager from app state
-        model_manager = request.app.state.model_manager
-        moderation_service = ModerationService(model_manager, get_database())
+        # Run the pattern pre-filter first; the model only sees texts it passes
+        moderation_result = _prefilter_result(
+            prefilter,
+            moderation_request.review_id or moderation_request.listing_id,
+            moderation_request.text
+        )
         
         # Perform moderation analysis with review-specific rules
-        moderation_result = await moderation_service.moderate_content(
-            content_id=moderation_request.review_id or moderation_request.listing_id,
-            content_type="review",
-            text=moderation_request.text,
-            additional_context={
-                "rating": moderation_request.additional_context.get("rating", 0),
-                "reviewer_history": moderation_request.additional_context.get("reviewer_history", {}),
-                "listing_id": moderation_request.additional_context.get("listing_id", "")
-            }
-        )
+        if moderation_result is None:
+            moderation_result = await moderation_service.moderate_content(
+                content_id=moderation_request.review_id or moderation_request.listing_id,
+                content_type="review",
+                text=moderation_request.text,
+                additional_context={
+                    "rating": moderation_request.additional_context.get("rating", 0),
+                    "reviewer_history": moderation_request.additional_context.get("reviewer_history", {}),
+                    "listing_id": moderation_request.additional_context.get("listing_id", "")
+                }
+            )
         
-        # Log moderation action
-        await moderation_service.log_moderation_action(
+        # Log moderation action after the response is sent
+        background_tasks.add_task(
+            moderation_service.log_moderation_action,
             content_id=moderation_request.review_id or moderation_request.listing_id,
             content_type="review",
             moderation_result=moderation_result
@@ -124,10 +228,16 @@ async def moderate_review(
             detail=f"Review moderation failed: {str(e)}"
         )
 
-@router.post("/batch")
+@router.post(
+    "/batch",
+    response_model=None,
+    dependencies=[require_model("moderation")]
+)
 async def moderate_batch_content(
     moderation_requests: list[ModerationRequest],
-    request: Request = None,
+    moderation_service: ModerationService = Depends(get_moderation_service),
+    prefilter: PatternPrefilter = Depends(get_prefilter),
+    runtime_settings: RuntimeSettings = Depends(get_app_runtime_settings),
 ) -> Dict[str, Any]:
     """
     Moderate multiple pieces of content in batch.
@@ -136,31 +246,46 @@ async def moderate_batch_content(
     with optimized batch processing for efficiency.
     """
     try:
-        # Get model manager from app state
-        model_manager = request.app.state.model_manager
-        moderation_service = ModerationService(model_manager, get_database())
+        # Run the pattern pre-filter first; the model only sees texts it passes
+        batch_results = [
+            _prefilter_result(
+                prefilter,
+                moderation_request.review_id or moderation_request.listing_id,
+                moderation_request.text
+            )
+            for moderation_request in moderation_requests
+        ]
+        pending = [
+            i for i, result in enumerate(batch_results) if result is None
+        ]
         
-        # Process batch moderation
-        batch_results = await moderation_service.moderate_batch(moderation_requests)
+        # Process batch moderation in model-sized chunks, one forward pass each
+        max_batch_size = runtime_settings.MODERATION_BATCH_SIZE
+        for start in range(0, len(pending), max_batch_size):
+            chunk = pending[start:start + max_batch_size]
+            chunk_results = await moderation_service.moderate_batch(
+                [moderation_requests[i] for i in chunk]
+            )
+            for i, result in zip(chunk, chunk_results):
+                batch_results[i] = result
         
         # Count flagged items
-        flagged_count = sum(1 for result in batch_results if result.is_flagged)
+        flagged_count = sum(result.is_flagged for result in batch_results)
         
-        return {
-            "success": True,
-            "total_processed": len(moderation_requests),
-            "flagged_count": flagged_count,
-            "results": [
-                {
-                    "content_id": result.content_id,
-                    "is_flagged": result.is_flagged,
-                    "confidence_score": result.confidence_score,
-                    "flagged_categories": result.flagged_categories,
-                    "recommended_action": result.recommended_action
-                }
-                for result in batch_results
-            ]
-        }
+        # Encode directly to bytes; large batches are built off the event loop
+        if len(batch_results) > BATCH_SERIALIZE_THREAD_THRESHOLD:
+            body = await asyncio.to_thread(
+                _encode_batch_response,
+                len(moderation_requests),
+                flagged_count,
+                batch_results
+            )
+        else:
+            body = _encode_batch_response(
+                len(moderation_requests), flagged_count, batch_results
+            )
+        
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
         logger.error(f"Batch moderation failed: {e}")
@@ -171,7 +296,7 @@ async def moderate_batch_content(
 
 @router.get("/stats")
 async def get_moderation_stats(
-    request: Request = None,
+    moderation_service: ModerationService = Depends(get_moderation_service),
 ) -> Dict[str, Any]:
     """
     Get moderation statistics and metrics.
@@ -180,19 +305,16 @@ async def get_moderation_stats(
     for monitoring and quality assurance purposes.
     """
     try:
-        model_manager = request.app.state.model_manager
-        moderation_service = ModerationService(model_manager, get_database())
-        
         stats = await moderation_service.get_moderation_stats()
         
-        return {
+        return ORJSONResponse(content={
             "total_moderated": stats["total_moderated"],
             "flagged_percentage": stats["flagged_percentage"],
             "categories_breakdown": stats["categories_breakdown"],
             "model_performance": stats["model_performance"],
             "recent_trends": stats["recent_trends"],
             "last_updated": stats["last_updated"]
-        }
+        })
         
     except Exception as e:
         logger.error(f"Failed to get moderation stats: {e}")
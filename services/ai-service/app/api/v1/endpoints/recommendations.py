@@ -1,25 +1,69 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from typing import List
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Any, AsyncIterator, Dict, Iterable, List
+from decimal import Decimal
 import logging
 
+import orjson
+
 from app.schemas.recommendations import (
     RecommendationResult,
     UserInteractionCreate,
     RecommendationRequest,
     RecommendationResponse
 )
+from app.api.deps import (
+    get_background_worker,
+    get_recommend_service,
+    get_shared_cache,
+    require_model
+)
+from app.core.background import BackgroundWorker
 from app.services.recommend_service import RecommendService
-from app.core.database import get_database
+from app.core.caching import get_cached_similar, set_cached_similar
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.get("/", response_model=RecommendationResponse)
+
+def _json_default(value: Any) -> Any:
+    """Encode values orjson has no native support for, such as DB decimals."""
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+async def _stream_recommendations(
+    recommendations: Iterable[Dict[str, Any]],
+) -> AsyncIterator[bytes]:
+    """Yield recommendations as NDJSON lines, one encoded record at a time."""
+    for rec in recommendations:
+        yield orjson.dumps({
+            "listing_id": rec["listing_id"],
+            "title": rec["title"],
+            "description": rec["description"],
+            "price": rec["price"],
+            "campus_id": rec["campus_id"],
+            "confidence_score": rec["confidence_score"],
+            "recommendation_reason": rec["reason"],
+            "similarity_type": rec["similarity_type"],
+            "created_at": rec["created_at"]
+        }, default=_json_default) + b"\n"
+
+
+@router.get(
+    "/",
+    response_model=RecommendationResponse,
+    dependencies=[require_model("recommendation"), require_model("embedding")]
+)
 async def get_personalized_recommendations(
     user_id: int = Query(..., description="User ID for personalized recommendations"),
     limit: int = Query(10, le=50, description="Number of recommendations to return"),
     exclude_own: bool = Query(True, description="Exclude user's own listings"),
     campus_only: bool = Query(False, description="Limit to user's campus only"),
+    recommend_service: RecommendService = Depends(get_recommend_service),
     request: Request = None,
 ) -> RecommendationResponse:
     """
@@ -27,12 +71,11 @@ async def get_personalized_recommendations(
     
     Uses collaborative filtering (SVD) combined with content-based filtering
     to provide personalized listing recommendations.
+    
+    Send `Accept: application/x-ndjson` to receive the recommendations as
+    a stream of newline-delimited JSON records instead of a single document.
     """
     try:
-        # Get model manager from app state
-        model_manager = request.app.state.model_manager
-        recommend_service = RecommendService(model_manager, get_database())
-        
         # Get user's recommendation preferences
         user_profile = await recommend_service.get_user_profile(user_id)
         
@@ -44,6 +87,13 @@ async def get_personalized_recommendations(
             campus_only=campus_only
         )
         
+        # Stream records as they are encoded when the client asks for NDJSON
+        if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+            return StreamingResponse(
+                _stream_recommendations(recommendations),
+                media_type=NDJSON_MEDIA_TYPE
+            )
+        
         # Convert to response format
         recommendation_results = [
             RecommendationResult(
@@ -65,7 +115,7 @@ async def get_personalized_recommendations(
             recommendations=recommendation_results,
             total_count=len(recommendation_results),
             algorithm_version="hybrid_v1.0",
-            generated_at=datetime.utcnow()
+            generated_at=request.app.state.now
         )
         
     except Exception as e:
@@ -75,10 +125,11 @@ async def get_personalized_recommendations(
             detail=f"Failed to generate recommendations: {str(e)}"
         )
 
-@router.post("/interactions/")
+@router.post("/interactions/", dependencies=[require_model("recommendation")])
 async def log_user_interaction(
     interaction: UserInteractionCreate,
-    request: Request = None,
+    recommend_service: RecommendService = Depends(get_recommend_service),
+    background_worker: BackgroundWorker = Depends(get_background_worker),
 ) -> dict:
     """
     Log user behavior for recommendation training (Internal API).
@@ -87,10 +138,6 @@ async def log_user_interaction(
     the recommendation algorithm over time.
     """
     try:
-        # Get model manager from app state
-        model_manager = request.app.state.model_manager
-        recommend_service = RecommendService(model_manager, get_database())
-        
         # Store the interaction
         interaction_id = await recommend_service.log_interaction(
             user_id=interaction.user_id,
@@ -100,19 +147,20 @@ async def log_user_interaction(
             context_data=interaction.context_data
         )
         
-        # Update user profile incrementally if needed
-        await recommend_service.update_user_profile_incremental(
+        # Update user profile incrementally off the request path
+        background_worker.enqueue(
+            recommend_service.update_user_profile_incremental,
             user_id=interaction.user_id,
             interaction=interaction
         )
         
         logger.info(f"Logged interaction {interaction_id} for user {interaction.user_id}")
         
-        return {
+        return ORJSONResponse(content={
             "success": True,
             "interaction_id": interaction_id,
             "message": "Interaction logged successfully"
-        }
+        })
         
     except Exception as e:
         logger.error(f"Failed to log interaction for user {interaction.user_id}: {e}")
@@ -121,9 +169,9 @@ async def log_user_interaction(
             detail=f"Failed to log interaction: {str(e)}"
         )
 
-@router.post("/train/")
+@router.post("/train/", dependencies=[require_model("recommendation")])
 async def trigger_recommendation_training(
-    request: Request = None,
+    recommend_service: RecommendService = Depends(get_recommend_service),
 ) -> dict:
     """
     Trigger SVD model retraining (Admin/Internal API).
@@ -132,21 +180,17 @@ async def trigger_recommendation_training(
     retraining process. Typically scheduled nightly or weekly.
     """
     try:
-        # Get model manager from app state
-        model_manager = request.app.state.model_manager
-        recommend_service = RecommendService(model_manager, get_database())
-        
         # Start training job
         training_job_id = await recommend_service.trigger_model_training()
         
         logger.info(f"Started recommendation model training job: {training_job_id}")
         
-        return {
+        return ORJSONResponse(content={
             "success": True,
             "job_id": training_job_id,
             "message": "Recommendation model training started",
             "estimated_duration": "30-60 minutes"
-        }
+        })
         
     except Exception as e:
         logger.error(f"Failed to start recommendation training: {e}")
@@ -155,11 +199,12 @@ async def trigger_recommendation_training(
             detail=f"Failed to start training: {str(e)}"
         )
 
-@router.get("/similar/{listing_id}")
+@router.get("/similar/{listing_id}", dependencies=[require_model("embedding")])
 async def get_similar_listings(
     listing_id: int,
     limit: int = Query(10, le=20, description="Number of similar listings"),
-    request: Request = None,
+    recommend_service: RecommendService = Depends(get_recommend_service),
+    cache=Depends(get_shared_cache),
 ) -> List[RecommendationResult]:
     """
     Get similar listings based on content similarity.
@@ -167,13 +212,17 @@ async def get_similar_listings(
     Uses content-based filtering to find listings similar to the given listing.
     """
     try:
-        model_manager = request.app.state.model_manager
-        recommend_service = RecommendService(model_manager, get_database())
-        
-        similar_listings = await recommend_service.get_content_similar_listings(
-            listing_id=listing_id,
-            limit=limit
+        similar_listings, epoch = await get_cached_similar(
+            cache, listing_id, limit
         )
+        if similar_listings is None:
+            similar_listings = await recommend_service.get_content_similar_listings(
+                listing_id=listing_id,
+                limit=limit
+            )
+            await set_cached_similar(
+                cache, listing_id, limit, similar_listings, epoch
+            )
         
         return [
             RecommendationResult(
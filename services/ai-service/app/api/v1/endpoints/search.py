@@ -1,26 +1,98 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
 import logging
 
+import numpy as np
+
 from app.schemas.search import (
     ListingSearchResult,
     ListingEmbeddingCreate,
     SearchResponse
 )
+from app.api.deps import (
+    get_ann_index,
+    get_embed_service,
+    get_query_embedder,
+    get_shared_cache,
+    require_model
+)
+from app.core.ann_sync import ReplicatedANNIndex
 from app.services.embed_service import EmbedService
-from app.core.database import get_database
-from app.core.cache import get_cache
+from app.core.caching import invalidate_similar
+
+# Initial ANN candidates fetched per result when filtering by campus
+CAMPUS_FILTER_OVERSAMPLE = 4
+
+# Bounds on the ANN candidates (and metadata rows) one search may touch
+SEARCH_MAX_FETCH_K = 1000
+MAX_SEARCH_OFFSET = 500
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.get("/", response_model=SearchResponse)
+async def _search_until_full(
+    ann_index: ReplicatedANNIndex,
+    embed_service: EmbedService,
+    query_embedding: np.ndarray,
+    campus_id: Optional[int],
+    count: int,
+) -> List[Dict[str, Any]]:
+    """
+    Return the top ``count`` listings passing the campus filter.
+    
+    Filtering happens after the ANN search, so the fetch is doubled until
+    enough hits survive, the index runs out, or SEARCH_MAX_FETCH_K
+    candidates have been searched. Past that cap a sparse campus gets a
+    short page rather than a scan of the whole index.
+    """
+    max_fetch_k = max(count, SEARCH_MAX_FETCH_K)
+    fetch_k = count if campus_id is None else count * CAMPUS_FILTER_OVERSAMPLE
+    fetch_k = min(fetch_k, max_fetch_k)
+    listings: Dict[int, Dict[str, Any]] = {}
+    fetched: Set[int] = set()
+    while True:
+        hits = ann_index.search(query_embedding, fetch_k)
+        
+        # Fetch metadata for the new hits in one query
+        new_ids = [
+            listing_id for listing_id, _ in hits if listing_id not in fetched
+        ]
+        if new_ids:
+            listings.update(await embed_service.get_listings_by_ids(new_ids))
+            fetched.update(new_ids)
+        
+        results = [
+            {**listings[listing_id], "similarity_score": score}
+            for listing_id, score in hits
+            if listing_id in listings
+            and (
+                campus_id is None
+                or listings[listing_id]["campus_id"] == campus_id
+            )
+        ]
+        exhausted = len(hits) < fetch_k or fetch_k >= max_fetch_k
+        if len(results) >= count or exhausted:
+            return results[:count]
+        fetch_k = min(fetch_k * 2, max_fetch_k)
+
+@router.get(
+    "/",
+    response_model=SearchResponse,
+    dependencies=[require_model("embedding")]
+)
 async def search_listings(
     q: str = Query(..., description="Search query"),
     campus_id: Optional[int] = Query(None, description="Campus ID filter"),
     limit: int = Query(20, le=100, description="Maximum number of results"),
-    offset: int = Query(0, ge=0, description="Offset for pagination"),
-    request: Request = None,
+    offset: int = Query(
+        0, ge=0, le=MAX_SEARCH_OFFSET, description="Offset for pagination"
+    ),
+    embed_service: EmbedService = Depends(get_embed_service),
+    query_embedder: Callable[[str], Awaitable[np.ndarray]] = Depends(
+        get_query_embedder
+    ),
+    ann_index: ReplicatedANNIndex = Depends(get_ann_index),
 ) -> SearchResponse:
     """
     Search for listings using semantic search with embeddings.
@@ -29,20 +101,17 @@ async def search_listings(
     to find the most relevant listings based on the query.
     """
     try:
-        # Get model manager from app state
-        model_manager = request.app.state.model_manager
-        embed_service = EmbedService(model_manager, get_database(), get_cache())
-        
-        # Generate query embedding
-        query_embedding = await embed_service.generate_embedding(q)
-        
-        # Perform vector search
-        results = await embed_service.search_similar_listings(
-            query_embedding=query_embedding,
-            campus_id=campus_id,
-            limit=limit,
-            offset=offset
-        )
+        # Generate query embedding (cached, batched with concurrent searches)
+        query_embedding = await query_embedder(q)
+        
+        # Perform vector search against the in-process ANN index
+        results = (await _search_until_full(
+            ann_index,
+            embed_service,
+            query_embedding,
+            campus_id,
+            offset + limit
+        ))[offset:]
         
         # Convert results to response format
         search_results = [
@@ -73,10 +142,12 @@ async def search_listings(
             detail=f"Search failed: {str(e)}"
         )
 
-@router.post("/embeddings")
+@router.post("/embeddings", dependencies=[require_model("embedding")])
 async def create_listing_embedding(
     embedding_data: ListingEmbeddingCreate,
-    request: Request = None,
+    embed_service: EmbedService = Depends(get_embed_service),
+    cache=Depends(get_shared_cache),
+    ann_index: ReplicatedANNIndex = Depends(get_ann_index),
 ) -> dict:
     """
     Generate and store embeddings for a listing (Internal API).
@@ -85,14 +156,10 @@ async def create_listing_embedding(
     is created or updated to populate the vector database.
     """
     try:
-        # Get model manager from app state
-        model_manager = request.app.state.model_manager
-        embed_service = EmbedService(model_manager, get_database(), get_cache())
-        
         # Generate embedding for the listing text
         embedding = await embed_service.generate_embedding(embedding_data.text)
         
-        # Store embedding in vector database
+        # Store embedding in vector database, in the type the client expects
         await embed_service.store_listing_embedding(
             listing_id=embedding_data.listing_id,
             embedding=embedding,
@@ -105,14 +172,21 @@ async def create_listing_embedding(
             }
         )
         
+        # Replicate the new vector (sent as float16) into every worker's ANN
+        # index
+        await ann_index.publish_upsert(embedding_data.listing_id, embedding)
+        
+        # Listing content changed, so its cached neighbours are stale
+        await invalidate_similar(cache, embedding_data.listing_id)
+        
         logger.info(f"Created embedding for listing {embedding_data.listing_id}")
         
-        return {
+        return ORJSONResponse(content={
             "success": True,
             "listing_id": embedding_data.listing_id,
             "embedding_dimension": len(embedding),
             "message": "Embedding created successfully"
-        }
+        })
         
     except Exception as e:
         logger.error(f"Failed to create embedding for listing {embedding_data.listing_id}: {e}")
@@ -123,7 +197,7 @@ async def create_listing_embedding(
 
 @router.post("/train")
 async def trigger_embedding_training(
-    request: Request = None,
+    embed_service: EmbedService = Depends(get_embed_service),
 ) -> dict:
     """
     Trigger embedding model training/update process (Admin/Internal API).
@@ -132,21 +206,17 @@ async def trigger_embedding_training(
     a major update to the model or when the database grows significantly.
     """
     try:
-        # Get model manager from app state
-        model_manager = request.app.state.model_manager
-        embed_service = EmbedService(model_manager, get_database(), get_cache())
-        
         # Trigger background training process
         training_job_id = await embed_service.trigger_model_training()
         
         logger.info(f"Started embedding model training job: {training_job_id}")
         
-        return {
+        return ORJSONResponse(content={
             "success": True,
             "job_id": training_job_id,
             "message": "Embedding training started",
             "status": "training"
-        }
+        })
         
     except Exception as e:
         logger.error(f"Failed to start embedding training: {e}")
@@ -158,25 +228,22 @@ async def trigger_embedding_training(
 @router.get("/train/status/{job_id}")
 async def get_training_status(
     job_id: str,
-    request: Request = None,
+    embed_service: EmbedService = Depends(get_embed_service),
 ) -> dict:
     """
     Get the status of a training job.
     """
     try:
-        model_manager = request.app.state.model_manager
-        embed_service = EmbedService(model_manager, get_database(), get_cache())
-        
         status = await embed_service.get_training_status(job_id)
         
-        return {
+        return ORJSONResponse(content={
             "job_id": job_id,
             "status": status["status"],
             "progress": status.get("progress", 0),
             "message": status.get("message", ""),
             "started_at": status.get("started_at"),
             "completed_at": status.get("completed_at")
-        }
+        })
         
     except Exception as e:
         logger.error(f"Failed to get training status for job {job_id}: {e}")
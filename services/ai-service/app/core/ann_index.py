@@ -0,0 +1,155 @@
+"""
+In-process approximate nearest-neighbour index over listing embeddings.
+
+Wraps a FAISS HNSW graph, storing vectors as float16 scalar-quantized codes,
+with a parallel listing-id map. HNSW cannot delete vectors, so re-embedded
+listings are appended and their older positions are skipped at query time,
+widening the search only when they crowd out live hits;
+once stale positions pass a fraction of the index, it is rebuilt from the
+latest vector per listing.
+"""
+
+import logging
+import math
+from typing import Dict, List, Sequence, Tuple
+
+import faiss
+import numpy as np
+
+# Constants
+DEFAULT_HNSW_M = 32
+DEFAULT_EF_CONSTRUCTION = 80
+DEFAULT_EF_SEARCH = 64
+COMPACT_STALE_FRACTION = 0.2
+COMPACT_MIN_STALE = 1000
+
+# Module-level logger
+logger = logging.getLogger(__name__)
+
+
+class ListingANNIndex:
+    """HNSW index mapping listing embeddings to listing IDs (inner-product)."""
+
+    def __init__(
+        self,
+        dim: int,
+        m: int = DEFAULT_HNSW_M,
+        ef_construction: int = DEFAULT_EF_CONSTRUCTION,
+        ef_search: int = DEFAULT_EF_SEARCH,
+    ):
+        self.dim = dim
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.index = faiss.IndexHNSWSQ(
+            dim, faiss.ScalarQuantizer.QT_fp16, m, faiss.METRIC_INNER_PRODUCT
+        )
+        self.index.hnsw.efConstruction = ef_construction
+        self.index.hnsw.efSearch = ef_search
+        self._id_map: List[int] = []
+        self._latest: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+    @property
+    def stale_count(self) -> int:
+        """Positions holding a superseded vector."""
+        return self.index.ntotal - len(self._latest)
+
+    def needs_compaction(self) -> bool:
+        """Whether stale positions inflate every search enough to rebuild."""
+        stale = self.stale_count
+        return (
+            stale >= COMPACT_MIN_STALE
+            and stale > COMPACT_STALE_FRACTION * self.index.ntotal
+        )
+
+    def compacted(self) -> "ListingANNIndex":
+        """Return a new index holding only the latest vector per listing.
+
+        Only reads this index, so it can run in a thread while searches
+        continue.
+        """
+        listing_ids = list(self._latest)
+        positions = [self._latest[listing_id] for listing_id in listing_ids]
+        fresh = ListingANNIndex(
+            self.dim,
+            self.m,
+            self.ef_construction,
+            self.ef_search,
+        )
+        if listing_ids:
+            # fp16 codes decode and re-encode losslessly
+            vectors = self.index.reconstruct_n(0, self.index.ntotal)
+            fresh.build(listing_ids, vectors[positions])
+        return fresh
+
+    def build(
+        self,
+        listing_ids: Sequence[int],
+        embeddings: np.ndarray,
+    ) -> None:
+        """Bulk-load embeddings, typically once at startup."""
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32).reshape(
+            -1, self.dim
+        )
+        if len(listing_ids) != vectors.shape[0]:
+            raise ValueError(
+                "listing_ids and embeddings must have the same length",
+            )
+
+        if not self.index.is_trained:
+            # fp16 scalar quantization has no learned parameters; this only
+            # flips the trained flag
+            self.index.train(vectors)
+
+        start = self.index.ntotal
+        self.index.add(vectors)
+        for offset, listing_id in enumerate(listing_ids):
+            self._id_map.append(int(listing_id))
+            self._latest[int(listing_id)] = start + offset
+        count = vectors.shape[0]
+        logger.info(f"ANN index loaded {count} embeddings (dim={self.dim})")
+
+    def upsert(self, listing_id: int, embedding: np.ndarray) -> None:
+        """Add or replace the embedding for a single listing."""
+        self.build([listing_id], np.asarray(embedding).reshape(1, -1))
+
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        k: int,
+    ) -> List[Tuple[int, float]]:
+        """Return up to ``k`` ``(listing_id, score)`` pairs, best first."""
+        if k <= 0 or self.index.ntotal == 0:
+            return []
+
+        query = np.ascontiguousarray(query_embedding, dtype=np.float32)
+        query = query.reshape(1, -1)
+        # Stale positions are spread through the graph, so about
+        # k * ntotal / live candidates hold k live ones; widen only if not
+        ntotal = self.index.ntotal
+        live = max(len(self._latest), 1)
+        fetch_k = min(math.ceil(k * ntotal / live), ntotal)
+        while True:
+            hits = self._live_hits(query, fetch_k, k)
+            if len(hits) == k or fetch_k == ntotal:
+                return hits
+            fetch_k = min(fetch_k * 2, ntotal)
+
+    def _live_hits(
+        self, query: np.ndarray, fetch_k: int, k: int
+    ) -> List[Tuple[int, float]]:
+        scores, positions = self.index.search(query, fetch_k)
+        hits = []
+        for score, position in zip(scores[0], positions[0]):
+            if position < 0:
+                continue
+            listing_id = self._id_map[position]
+            if self._latest[listing_id] != position:
+                continue
+            hits.append((listing_id, float(score)))
+            if len(hits) == k:
+                break
+        return hits
@@ -0,0 +1,142 @@
+"""
+Cross-process replication of the in-process ANN index.
+
+Each uvicorn worker holds its own ListingANNIndex. Writers publish every
+re-embedded listing on a Redis pub/sub channel rather than upserting
+locally, and every worker, the publisher included, applies it. Workers
+subscribe before bulk-loading from the database, so upserts published
+during the load are buffered and applied after it. If the subscription
+drops, the worker resubscribes and reloads the index from the database,
+which stays the source of truth. When re-embedded listings leave too many
+stale positions behind, the index is compacted in a thread and swapped in.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.ann_index import ListingANNIndex
+
+# Constants
+ANN_UPSERT_CHANNEL = "ann:upserts"
+RESYNC_DELAY_SECONDS = 1.0
+
+# Module-level logger
+logger = logging.getLogger(__name__)
+
+EmbeddingLoader = Callable[[], Awaitable[Tuple[Sequence[int], np.ndarray]]]
+
+
+def encode_upsert(listing_id: int, embedding: Any) -> bytes:
+    """Pack a listing id and its float16 embedding into one message."""
+    return (
+        np.int64(listing_id).tobytes()
+        + np.asarray(embedding, dtype=np.float16).tobytes()
+    )
+
+
+def decode_upsert(data: bytes) -> Tuple[int, np.ndarray]:
+    """Unpack a message built by ``encode_upsert``."""
+    listing_id = int(np.frombuffer(data[:8], dtype=np.int64)[0])
+    return listing_id, np.frombuffer(data[8:], dtype=np.float16)
+
+
+class ReplicatedANNIndex:
+    """ListingANNIndex kept in step across processes through Redis pub/sub."""
+
+    def __init__(self, cache, dim: int, channel: str = ANN_UPSERT_CHANNEL):
+        self.cache = cache
+        self.dim = dim
+        self.channel = channel
+        self.index = ListingANNIndex(dim)
+        self._load_embeddings: Optional[EmbeddingLoader] = None
+        self._pubsub = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        k: int,
+    ) -> List[Tuple[int, float]]:
+        """Search the current local index."""
+        return self.index.search(query_embedding, k)
+
+    async def start(self, load_embeddings: EmbeddingLoader) -> None:
+        """Subscribe, load the index and start applying upserts."""
+        self._load_embeddings = load_embeddings
+        await self._sync()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop applying upserts and drop the subscription."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        await self._unsubscribe()
+
+    async def publish_upsert(self, listing_id: int, embedding: Any) -> None:
+        """Send an upsert to every process, this one included."""
+        message = encode_upsert(listing_id, embedding)
+        await self.cache.publish(self.channel, message)
+
+    async def _sync(self) -> None:
+        await self._unsubscribe()
+        self._pubsub = self.cache.pubsub()
+        await self._pubsub.subscribe(self.channel)
+
+        listing_ids, embeddings = await self._load_embeddings()
+        index = ListingANNIndex(self.dim)
+        await asyncio.to_thread(index.build, listing_ids, embeddings)
+        self.index = index
+
+    async def _unsubscribe(self) -> None:
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.reset()
+            except Exception as e:
+                logger.warning(f"Failed to close ANN upsert subscription: {e}")
+            self._pubsub = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async for message in self._pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    self._apply(message["data"])
+                    if self.index.needs_compaction():
+                        await self._compact()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    f"ANN upsert subscription lost, reloading index: {e}",
+                )
+                await asyncio.sleep(RESYNC_DELAY_SECONDS)
+                try:
+                    await self._sync()
+                except Exception as e:
+                    logger.error(f"ANN index reload failed: {e}")
+
+    async def _compact(self) -> None:
+        # Upserts buffer in the subscription meanwhile, so nothing writes
+        # to the index being copied
+        stale = self.index.stale_count
+        self.index = await asyncio.to_thread(self.index.compacted)
+        logger.info(f"Compacted ANN index, dropped {stale} stale positions")
+
+    def _apply(self, data: bytes) -> None:
+        try:
+            listing_id, embedding = decode_upsert(data)
+            self.index.upsert(listing_id, embedding)
+        except Exception as e:
+            logger.error(f"Failed to apply ANN upsert: {e}")
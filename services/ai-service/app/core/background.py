@@ -0,0 +1,91 @@
+"""
+In-process queue for write-behind work that responses don't depend on.
+
+Jobs are dropped rather than blocking a request when the queue is full, or
+left unrun when shutdown can't drain the queue in time; both are counted
+in ``ai_service_background_jobs_dropped_total``.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+from prometheus_client import Counter
+
+# Constants
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_DRAIN_TIMEOUT_SECONDS = 10.0
+
+JOBS_DROPPED = Counter(
+    "ai_service_background_jobs_dropped_total",
+    "Background jobs dropped without running",
+    ["worker", "reason"],
+)
+
+# Module-level logger
+logger = logging.getLogger(__name__)
+
+
+class BackgroundWorker:
+    """Run queued coroutine calls one at a time on a background task."""
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        name: str = "background_worker",
+        drain_timeout: float = DEFAULT_DRAIN_TIMEOUT_SECONDS,
+    ):
+        self.name = name
+        self.drain_timeout = drain_timeout
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._worker: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start consuming queued jobs."""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+            logger.info(f"Started {self.name}")
+
+    async def stop(self) -> None:
+        """Finish queued jobs for up to ``drain_timeout``s, then stop."""
+        if self._worker is not None:
+            try:
+                await asyncio.wait_for(
+                    self._queue.join(),
+                    timeout=self.drain_timeout,
+                )
+            except asyncio.TimeoutError:
+                abandoned = self._queue.qsize()
+                JOBS_DROPPED.labels(self.name, "shutdown").inc(abandoned)
+                logger.warning(
+                    f"{self.name} did not drain within {self.drain_timeout}s, "
+                    f"abandoning {abandoned} queued jobs"
+                )
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def enqueue(
+        self, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any
+    ) -> None:
+        """Queue ``fn(*args, **kwargs)`` without waiting for it to run."""
+        try:
+            self._queue.put_nowait((fn, args, kwargs))
+        except asyncio.QueueFull:
+            JOBS_DROPPED.labels(self.name, "queue_full").inc()
+            logger.warning(
+                f"{self.name} queue full, dropping {fn.__qualname__}",
+            )
+
+    async def _run(self) -> None:
+        while True:
+            fn, args, kwargs = await self._queue.get()
+            try:
+                await fn(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"{self.name} job {fn.__qualname__} failed: {e}")
+            finally:
+                self._queue.task_done()
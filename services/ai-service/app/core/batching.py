@@ -0,0 +1,115 @@
+"""
+Dynamic micro-batching for single-item inference endpoints.
+
+Concurrent requests that each need one model forward pass are queued and
+coalesced into a single batched call, then resolved individually.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+# Constants
+DEFAULT_MAX_BATCH_SIZE = 8
+DEFAULT_MAX_WAIT_MS = 10
+
+# Module-level logger
+logger = logging.getLogger(__name__)
+
+BatchFn = Callable[[List[Any]], Awaitable[Sequence[Any]]]
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-item calls into calls of ``batch_fn``."""
+
+    def __init__(
+        self,
+        batch_fn: BatchFn,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        name: str = "batcher",
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.name = name
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._batch: List[Tuple[Any, asyncio.Future]] = []
+
+    async def start(self) -> None:
+        """Start the background batching loop."""
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+            logger.info(
+                f"Started {self.name} (max_batch_size={self.max_batch_size}, "
+                f"max_wait_ms={self.max_wait * 1000:g})"
+            )
+
+    async def stop(self) -> None:
+        """Stop the batching loop and fail any requests queued or in flight."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        # Cancelling the worker abandons the batch it was collecting or running
+        pending = self._batch
+        self._batch = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                error = RuntimeError(f"{self.name} is shutting down")
+                future.set_exception(error)
+
+    async def submit(self, item: Any) -> Any:
+        """Queue a single item and wait for its result from the next batch."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                    batch.append(item)
+                except asyncio.TimeoutError:
+                    break
+
+            await self._process(batch)
+            self._batch = []
+
+    async def _process(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        items = [item for item, _ in batch]
+        try:
+            results = await self.batch_fn(items)
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"{self.name} expected {len(items)} results, "
+                    f"got {len(results)}",
+                )
+        except Exception as e:
+            logger.error(f"{self.name} failed on batch of {len(items)}: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
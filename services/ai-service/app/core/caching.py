@@ -0,0 +1,146 @@
+"""
+Redis-backed result caches for embedding and similarity lookups.
+
+Query embeddings are stored as raw float16 bytes keyed on a hash of the
+text; content-similar listings are stored per source listing so a listing
+update can drop every cached ``limit`` variant with a single delete. A
+reverse set per neighbour records which source listings returned it, so the
+update also drops every cached result the listing appears in. Writes are
+pipelined into one round trip, and an invalidation epoch discards results
+computed before an invalidation that could not see them.
+"""
+
+import functools
+import logging
+from hashlib import blake2b
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import orjson
+
+# Constants
+EMBEDDING_CACHE_PREFIX = "emb:f16:"
+SIMILAR_CACHE_PREFIX = "sim:"
+SIMILAR_REVERSE_PREFIX = "simref:"
+SIMILAR_EPOCH_KEY = "sim:epoch"
+DEFAULT_EMBEDDING_TTL = 3600
+DEFAULT_SIMILAR_TTL = 600
+
+# Returned as the epoch when it can't be read, so nothing gets cached
+EPOCH_UNAVAILABLE = object()
+
+# Module-level logger
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[str], Awaitable[Any]]
+
+
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def embedding_cache_key(text: str) -> str:
+    """Build the cache key for a query embedding."""
+    digest = blake2b(text.encode(), digest_size=16).hexdigest()
+    return EMBEDDING_CACHE_PREFIX + digest
+
+
+def cache_embeddings(
+    cache, ttl: int = DEFAULT_EMBEDDING_TTL
+) -> Callable[[EmbedFn], EmbedFn]:
+    """Cache the vectors returned by an ``async fn(text)`` embedder."""
+
+    def decorator(embed_fn: EmbedFn) -> EmbedFn:
+        @functools.wraps(embed_fn)
+        async def wrapper(text: str) -> np.ndarray:
+            key = embedding_cache_key(text)
+            try:
+                cached = await cache.get(key)
+            except Exception as e:
+                logger.warning(f"Embedding cache read failed: {e}")
+                cached = None
+
+            if cached is not None:
+                return np.frombuffer(cached, dtype=np.float16)
+
+            embedding = np.asarray(await embed_fn(text), dtype=np.float16)
+            try:
+                await cache.set(key, embedding.tobytes(), ex=ttl)
+            except Exception as e:
+                logger.warning(f"Embedding cache write failed: {e}")
+            return embedding
+
+        return wrapper
+
+    return decorator
+
+
+async def get_cached_similar(
+    cache, listing_id: int, limit: int
+) -> Tuple[Optional[List[Dict[str, Any]]], Any]:
+    """
+    Return ``(cached listings or None, epoch)`` in one round trip.
+
+    Pass the epoch to ``set_cached_similar`` when caching a freshly computed
+    result, so a write racing an invalidation is discarded.
+    """
+    try:
+        pipe = cache.pipeline(transaction=False)
+        pipe.hget(f"{SIMILAR_CACHE_PREFIX}{listing_id}", str(limit))
+        pipe.get(SIMILAR_EPOCH_KEY)
+        cached, epoch = await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Similar listings cache read failed: {e}")
+        return None, EPOCH_UNAVAILABLE
+    return (orjson.loads(cached) if cached is not None else None), epoch
+
+
+async def set_cached_similar(
+    cache,
+    listing_id: int,
+    limit: int,
+    listings: List[Dict[str, Any]],
+    epoch: Any,
+    ttl: int = DEFAULT_SIMILAR_TTL,
+) -> None:
+    """Cache content-similar listings computed as of ``epoch``."""
+    if epoch is EPOCH_UNAVAILABLE:
+        return
+
+    key = f"{SIMILAR_CACHE_PREFIX}{listing_id}"
+    try:
+        pipe = cache.pipeline(transaction=True)
+        pipe.hset(key, str(limit), orjson.dumps(listings))
+        pipe.expire(key, ttl)
+        for listing in listings:
+            reverse_key = f"{SIMILAR_REVERSE_PREFIX}{listing['listing_id']}"
+            pipe.sadd(reverse_key, listing_id)
+            pipe.expire(reverse_key, ttl)
+        pipe.get(SIMILAR_EPOCH_KEY)
+        results = await pipe.execute()
+
+        # An invalidation ran while this result was being computed; it could
+        # not see this entry, so drop it here
+        if results[-1] != epoch:
+            await cache.hdel(key, str(limit))
+    except Exception as e:
+        logger.warning(f"Similar listings cache write failed: {e}")
+
+
+async def invalidate_similar(cache, listing_id: int) -> None:
+    """Drop the listing's cached results and every result it appears in."""
+    reverse_key = f"{SIMILAR_REVERSE_PREFIX}{listing_id}"
+    try:
+        # Bump the epoch atomically with reading the reverse set, so writes
+        # that miss this delete see the new epoch and discard themselves
+        pipe = cache.pipeline(transaction=True)
+        pipe.incr(SIMILAR_EPOCH_KEY)
+        pipe.smembers(reverse_key)
+        _, sources = await pipe.execute()
+        await cache.delete(
+            f"{SIMILAR_CACHE_PREFIX}{listing_id}",
+            reverse_key,
+            *(SIMILAR_CACHE_PREFIX + _decode(source) for source in sources),
+        )
+    except Exception as e:
+        logger.warning(f"Similar listings cache invalidation failed: {e}")
@@ -0,0 +1,96 @@
+"""
+Keyword/regex pre-filter run before the moderation model.
+
+All patterns are compiled once at startup into a single Hyperscan database
+and matched in one pass per text. Without Hyperscan installed, the patterns
+are combined into one alternation regex instead, which reports only the
+first pattern when several match at the same position.
+"""
+
+import logging
+import re
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+try:
+    import hyperscan
+except ImportError:  # pragma: no cover - optional dependency
+    hyperscan = None
+
+# Module-level logger
+logger = logging.getLogger(__name__)
+
+Pattern = Tuple[str, str]
+
+
+def load_patterns(path: Optional[str]) -> List[Pattern]:
+    """Read ``category<TAB>regex`` lines, skipping blanks and comments."""
+    if not path:
+        return []
+
+    patterns = []
+    lines = Path(path).read_text().splitlines()
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        category, sep, expression = line.partition("\t")
+        if not sep or not expression.strip():
+            raise ValueError(
+                f"{path}:{line_no}: expected 'category<TAB>regex'",
+            )
+        patterns.append((category.strip(), expression.strip()))
+    return patterns
+
+
+class PatternPrefilter:
+    """Match text against every banned pattern in a single scan."""
+
+    def __init__(self, patterns: List[Pattern]):
+        self.categories = [category for category, _ in patterns]
+        self._database = None
+        self._regex = None
+
+        if not patterns:
+            return
+
+        if hyperscan is not None:
+            flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+            self._database = hyperscan.Database()
+            self._database.compile(
+                expressions=[expr.encode() for _, expr in patterns],
+                ids=list(range(len(patterns))),
+                elements=len(patterns),
+                flags=[flags] * len(patterns),
+            )
+            logger.info(
+                f"Compiled {len(patterns)} moderation patterns with Hyperscan",
+            )
+        else:
+            self._regex = re.compile(
+                "|".join(
+                    f"(?P<p{i}>{expression})"
+                    for i, (_, expression) in enumerate(patterns)
+                ),
+                re.IGNORECASE,
+            )
+            logger.warning(
+                f"Hyperscan not installed; compiled {len(patterns)} "
+                "moderation patterns with re"
+            )
+
+    def scan(self, text: str) -> List[str]:
+        """Return the sorted categories of the patterns matching ``text``."""
+        matched: Set[str] = set()
+
+        if self._database is not None:
+
+            def on_match(pattern_id, start, end, flags, context):
+                matched.add(self.categories[pattern_id])
+
+            self._database.scan(text.encode(), match_event_handler=on_match)
+        elif self._regex is not None:
+            for match in self._regex.finditer(text):
+                matched.add(self.categories[int(match.lastgroup[1:])])
+
+        return sorted(matched)
@@ -0,0 +1,54 @@
+"""
+Typed settings for the serving and inference knobs this service adds.
+
+Kept apart from ``app.core.config.Settings`` so every value is parsed to
+its declared type (``"false"`` is False, ``"32"`` is 32) from the process
+environment or the service's ``.env`` file. Keys belonging to other
+settings are ignored rather than rejected.
+"""
+
+from functools import lru_cache
+from typing import List, Optional
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+# Constants
+ENV_FILES = (".env", "configs/.env")
+
+
+class RuntimeSettings(BaseSettings):
+    """Worker, batching, moderation and model-preloading settings."""
+
+    model_config = SettingsConfigDict(env_file=ENV_FILES, extra="ignore")
+
+    # uvicorn worker processes; 0 sizes to the available CPUs
+    WORKERS: int = Field(default=0, ge=0)
+
+    # Texts per moderation forward pass in /moderation/batch
+    MODERATION_BATCH_SIZE: int = Field(default=32, gt=0)
+
+    # Micro-batching of concurrent single-item inference calls
+    MICRO_BATCH_MAX_SIZE: int = Field(default=8, gt=0)
+    MICRO_BATCH_MAX_WAIT_MS: float = Field(default=10, ge=0)
+
+    # int8 dynamic quantization of the moderation model on CPU
+    MODERATION_QUANTIZE: bool = True
+
+    # category<TAB>regex pre-filter patterns; unset or empty disables it
+    MODERATION_PATTERNS_PATH: Optional[str] = None
+
+    # Comma-separated models loaded at startup; others load on first use
+    PRELOAD_MODELS: str = "embedding,moderation"
+
+    @property
+    def preload_models(self) -> List[str]:
+        """PRELOAD_MODELS as a list of names."""
+        names = self.PRELOAD_MODELS.split(",")
+        return [name.strip() for name in names if name.strip()]
+
+
+@lru_cache
+def get_runtime_settings() -> RuntimeSettings:
+    """Process-wide RuntimeSettings, read once."""
+    return RuntimeSettings()
@@ -0,0 +1,18 @@
+"""
+Torch thread-pool sizing for inference workers.
+
+Imported by app.main ahead of every other module so OMP_NUM_THREADS is set
+before torch initializes OpenMP. With several workers and concurrent
+handlers, per-call thread pools would otherwise oversubscribe the cores.
+The variable is read from the process environment (container or unit
+env), not from the .env settings file.
+"""
+
+import os
+
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
+import torch  # noqa: E402
+
+torch.set_num_threads(int(os.environ["OMP_NUM_THREADS"]))
+torch.set_num_interop_threads(1)
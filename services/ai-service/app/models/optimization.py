@@ -0,0 +1,40 @@
+"""
+Inference-time optimizations applied to loaded models at startup.
+"""
+
+import logging
+from typing import Any
+
+import torch
+
+# Module-level logger
+logger = logging.getLogger(__name__)
+
+
+def quantize_for_cpu(model: Any) -> Any:
+    """Dynamically quantize a model's Linear layers to int8 for CPU inference.
+
+    Wrappers that are not an ``nn.Module`` themselves (Detoxify, HF pipelines)
+    are quantized through their inner ``.model``; anything else is returned
+    unchanged.
+    """
+    if isinstance(model, torch.nn.Module):
+        return _quantize_module(model)
+
+    inner = getattr(model, "model", None)
+    if isinstance(inner, torch.nn.Module):
+        model.model = _quantize_module(inner)
+        return model
+
+    name = type(model).__name__
+    logger.warning(f"Skipping int8 quantization: {name} wraps no torch module")
+    return model
+
+
+def _quantize_module(module: torch.nn.Module) -> torch.nn.Module:
+    module.eval()
+    quantized = torch.ao.quantization.quantize_dynamic(
+        module, {torch.nn.Linear}, dtype=torch.qint8
+    )
+    logger.info(f"Quantized {type(module).__name__} Linear layers to int8")
+    return quantized
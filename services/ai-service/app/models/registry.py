@@ -0,0 +1,65 @@
+"""
+Per-model lazy loading on top of ModelManager.
+
+Each model is loaded on first use, at most once, so pods only pay the memory
+and startup cost for the models their traffic actually needs.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+# Module-level logger
+logger = logging.getLogger(__name__)
+
+ModelLoader = Callable[[], Awaitable[Any]]
+
+
+class LazyModel:
+    """A model loaded by ``loader`` on the first ``get()``."""
+
+    def __init__(self, name: str, loader: ModelLoader):
+        self.name = name
+        self._loader = loader
+        self._lock = asyncio.Lock()
+        self._model: Optional[Any] = None
+        self._loaded = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    async def get(self) -> Any:
+        """Return the model, loading it if no caller has yet."""
+        if not self._loaded:
+            async with self._lock:
+                if not self._loaded:
+                    logger.info(f"Loading {self.name} model...")
+                    self._model = await self._loader()
+                    self._loaded = True
+                    logger.info(f"Loaded {self.name} model")
+        return self._model
+
+
+class ModelRegistry:
+    """Named collection of lazily loaded models."""
+
+    def __init__(self, loaders: Dict[str, ModelLoader]):
+        self._models = {
+            name: LazyModel(name, loader) for name, loader in loaders.items()
+        }
+
+    def __getitem__(self, name: str) -> LazyModel:
+        return self._models[name]
+
+    async def preload(self, names: Iterable[str]) -> None:
+        """Load the named models concurrently."""
+        names = list(names)
+        unknown = sorted(set(names) - set(self._models))
+        if unknown:
+            expected = sorted(self._models)
+            raise ValueError(f"Unknown models {unknown}; expected {expected}")
+        await asyncio.gather(*(self._models[name].get() for name in names))
+
+    def all_loaded(self, names: Iterable[str]) -> bool:
+        return all(self._models[name].loaded for name in names)
@@ -0,0 +1,107 @@
+"""
+Production entrypoint: multi-worker uvicorn on uvloop and httptools.
+
+Socket limits are sized for sustained high request rates: a deep accept
+backlog so bursts aren't refused, a concurrency cap that sheds load with
+503s before workers fall over, and keep-alive long enough for clients to
+reuse connections.
+
+Without WORKERS, one worker is started per CPU this process may use (its
+affinity mask, capped by the cgroup CPU quota); production must set WORKERS.
+Workers share a PROMETHEUS_MULTIPROC_DIR so /metrics reports all of them.
+
+Run with ``python -m app.server``.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import uvicorn
+
+from app.core.config import get_settings
+from app.core.runtime_config import get_runtime_settings
+
+# Constants
+BACKLOG = 2048
+LIMIT_CONCURRENCY = 1000
+TIMEOUT_KEEP_ALIVE = 30
+CGROUP_V2_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+CGROUP_V1_CPU_QUOTA = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+CGROUP_V1_CPU_PERIOD = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    """CPU quota of this container in cores, or None when unlimited."""
+    try:
+        quota, period = CGROUP_V2_CPU_MAX.read_text().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        quota = int(CGROUP_V1_CPU_QUOTA.read_text())
+        period = int(CGROUP_V1_CPU_PERIOD.read_text())
+    except (OSError, ValueError):
+        return None
+    return quota / period if quota > 0 else None
+
+
+def _available_cpus() -> int:
+    """CPUs usable by this process, not the host's core count."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # sched_getaffinity is Linux-only
+        cpus = os.cpu_count() or 1
+
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, int(limit))
+    return max(cpus, 1)
+
+
+def _prepare_metrics_dir() -> None:
+    """Point every worker at one empty Prometheus multiprocess directory."""
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(
+            prefix="ai-service-metrics-"
+        )
+        return
+
+    # Samples left by a previous run would be summed into this one
+    Path(path).mkdir(parents=True, exist_ok=True)
+    for stale in Path(path).glob("*.db"):
+        stale.unlink()
+
+
+def main() -> None:
+    """Start uvicorn with one worker per usable CPU unless WORKERS is set."""
+    settings = get_settings()
+
+    workers = get_runtime_settings().WORKERS
+    if not workers:
+        if settings.ENVIRONMENT == "production":
+            raise SystemExit("WORKERS must be set explicitly in production")
+        workers = _available_cpus()
+
+    # Set before uvicorn spawns workers, which import prometheus_client
+    _prepare_metrics_dir()
+
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=settings.PORT,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        backlog=BACKLOG,
+        limit_concurrency=LIMIT_CONCURRENCY,
+        timeout_keep_alive=TIMEOUT_KEEP_ALIVE,
+        log_level=settings.LOG_LEVEL,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+Root pytest configuration.
+
+Lives at the service root so pytest puts this directory on sys.path and
+``app`` is importable when running ``pytest tests/``.
+"""
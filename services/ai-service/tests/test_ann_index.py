@@ -0,0 +1,175 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+import app.core.ann_index as ann_index
+from app.core.ann_index import ListingANNIndex
+from app.core.ann_sync import ReplicatedANNIndex, decode_upsert, encode_upsert
+
+DIM = 8
+
+
+def unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def basis(i):
+    vector = np.zeros(DIM, dtype=np.float32)
+    vector[i] = 1.0
+    return vector
+
+
+class FakePubSub:
+    """Redis pub/sub stand-in delivering from one in-memory queue."""
+
+    def __init__(self, queue):
+        self.queue = queue
+
+    async def subscribe(self, channel):
+        pass
+
+    async def listen(self):
+        while True:
+            yield {"type": "message", "data": await self.queue.get()}
+
+    async def reset(self):
+        pass
+
+
+class FakeCache:
+    """Async Redis stand-in supporting publish/pubsub."""
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+
+    async def publish(self, channel, data):
+        await self.queue.put(data)
+
+    def pubsub(self):
+        return FakePubSub(self.queue)
+
+
+class TestListingANNIndex:
+    """Test suite for ListingANNIndex."""
+
+    @pytest.fixture
+    def index(self):
+        """Index holding one axis-aligned embedding per listing."""
+        index = ListingANNIndex(DIM)
+        index.build([10, 11, 12, 13], np.stack([basis(i) for i in range(4)]))
+        return index
+
+    def test_search_returns_nearest_listing_first(self, index):
+        """Test inner-product ranking maps back to listing IDs."""
+        # Act
+        hits = index.search(unit([0.1, 0.0, 1.0, 0, 0, 0, 0, 0]), 2)
+
+        # Assert
+        assert [listing_id for listing_id, _ in hits] == [12, 10]
+        assert hits[0][1] > hits[1][1]
+
+    def test_build_rejects_mismatched_lengths(self):
+        """Test that IDs and embeddings must line up."""
+        # Act & Assert
+        with pytest.raises(ValueError, match="same length"):
+            ListingANNIndex(DIM).build([1, 2], np.stack([basis(0)]))
+
+    def test_upsert_skips_stale_positions(self, index):
+        """Test that a re-embedded listing is only found by its new vector."""
+        # Arrange
+        index.upsert(10, basis(5))
+
+        # Act
+        hits = index.search(basis(0), 4)
+
+        # Assert
+        assert len(index) == 4
+        assert index.stale_count == 1
+        assert [listing_id for listing_id, _ in hits].count(10) == 1
+        assert dict(hits)[10] == pytest.approx(0.0, abs=1e-3)
+        assert index.search(basis(5), 1)[0][0] == 10
+
+    def test_search_widens_past_clustered_stale_positions(self, index):
+        """Test that stale hits crowding the query still yield k live ones."""
+        # Arrange: five stale copies of listing 10 right on top of the query
+        for _ in range(5):
+            index.upsert(10, basis(1))
+        index.upsert(10, basis(5))
+
+        # Act
+        hits = index.search(basis(1), 2)
+
+        # Assert
+        assert len(hits) == 2
+        assert hits[0][0] == 11
+        assert len(dict(hits)) == 2
+
+    def test_compacted_drops_stale_positions(self, index, monkeypatch):
+        """Test that compaction keeps only the latest vector per listing."""
+        # Arrange
+        monkeypatch.setattr(ann_index, "COMPACT_MIN_STALE", 1)
+        index.upsert(10, basis(5))
+        index.upsert(11, basis(6))
+
+        # Act
+        assert index.needs_compaction()
+        compacted = index.compacted()
+
+        # Assert
+        assert compacted.stale_count == 0
+        assert len(compacted) == 4
+        assert compacted.search(basis(5), 1)[0][0] == 10
+        assert compacted.search(basis(6), 1)[0][0] == 11
+        assert compacted.search(basis(2), 1)[0][0] == 12
+
+    def test_needs_compaction_waits_for_min_stale(self, index):
+        """Test that a few stale positions don't trigger a rebuild."""
+        # Arrange
+        index.upsert(10, basis(5))
+
+        # Act & Assert
+        assert not index.needs_compaction()
+
+    def test_search_on_empty_index(self):
+        """Test that an empty index returns no hits."""
+        # Act & Assert
+        assert ListingANNIndex(DIM).search(basis(0), 5) == []
+
+
+class TestReplicatedANNIndex:
+    """Test suite for ReplicatedANNIndex."""
+
+    def test_upsert_message_round_trip(self):
+        """Test that listing id and float16 vector survive encoding."""
+        # Act
+        listing_id, embedding = decode_upsert(encode_upsert(42, basis(3)))
+
+        # Assert
+        assert listing_id == 42
+        assert embedding.dtype == np.float16
+        np.testing.assert_array_equal(embedding, basis(3))
+
+    @pytest.mark.asyncio
+    async def test_published_upserts_are_applied(self):
+        """Test that an upsert reaches the index through the channel."""
+
+        # Arrange
+        async def load_embeddings():
+            return [1], np.stack([basis(0)])
+
+        replicated = ReplicatedANNIndex(FakeCache(), DIM)
+        await replicated.start(load_embeddings)
+
+        # Act
+        await replicated.publish_upsert(2, basis(4))
+        for _ in range(100):
+            if len(replicated) == 2:
+                break
+            await asyncio.sleep(0.01)
+        await replicated.stop()
+
+        # Assert
+        assert len(replicated) == 2
+        assert replicated.search(basis(4), 1)[0][0] == 2
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from app.core.background import JOBS_DROPPED, BackgroundWorker
+
+
+def dropped(name, reason):
+    return JOBS_DROPPED.labels(worker=name, reason=reason)._value.get()
+
+
+class TestBackgroundWorker:
+    """Test suite for BackgroundWorker."""
+
+    @pytest.mark.asyncio
+    async def test_stop_runs_queued_jobs(self):
+        """Test that stop() drains jobs queued before it was called."""
+        # Arrange
+        done = []
+
+        async def job(n):
+            done.append(n)
+
+        worker = BackgroundWorker(name="test_drain")
+        await worker.start()
+        for n in range(3):
+            worker.enqueue(job, n)
+
+        # Act
+        await worker.stop()
+
+        # Assert
+        assert done == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_stop_gives_up_after_drain_timeout(self):
+        """Test that a stuck job can't hold shutdown past the drain timeout."""
+
+        # Arrange
+        async def stuck():
+            await asyncio.sleep(60)
+
+        worker = BackgroundWorker(name="test_timeout", drain_timeout=0.05)
+        await worker.start()
+        worker.enqueue(stuck)
+        worker.enqueue(stuck)
+        await asyncio.sleep(0)
+        before = dropped("test_timeout", "shutdown")
+
+        # Act
+        await asyncio.wait_for(worker.stop(), timeout=1)
+
+        # Assert
+        assert dropped("test_timeout", "shutdown") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_full_queue_counts_dropped_job(self):
+        """Test that a job rejected by a full queue is counted."""
+
+        # Arrange
+        async def job():
+            pass
+
+        worker = BackgroundWorker(maxsize=1, name="test_full")
+        worker.enqueue(job)
+        before = dropped("test_full", "queue_full")
+
+        # Act
+        worker.enqueue(job)
+
+        # Assert
+        assert dropped("test_full", "queue_full") == before + 1
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from app.core.batching import MicroBatcher
+
+
+class TestMicroBatcher:
+    """Test suite for MicroBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_submits_coalesce_into_one_batch(self):
+        """Test that concurrent single-item calls share one batch_fn call."""
+        # Arrange
+        calls = []
+
+        async def double(items):
+            calls.append(list(items))
+            return [item * 2 for item in items]
+
+        batcher = MicroBatcher(double, max_batch_size=8, max_wait_ms=50)
+        await batcher.start()
+
+        # Act
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+        await batcher.stop()
+
+        # Assert
+        assert results == [0, 2, 4, 6, 8]
+        assert calls == [[0, 1, 2, 3, 4]]
+
+    @pytest.mark.asyncio
+    async def test_batches_are_capped_at_max_batch_size(self):
+        """Test that a burst larger than max_batch_size is split."""
+        # Arrange
+        calls = []
+
+        async def identity(items):
+            calls.append(len(items))
+            return items
+
+        batcher = MicroBatcher(identity, max_batch_size=3, max_wait_ms=50)
+        await batcher.start()
+
+        # Act
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(7)))
+        await batcher.stop()
+
+        # Assert
+        assert results == list(range(7))
+        assert calls == [3, 3, 1]
+
+    @pytest.mark.asyncio
+    async def test_batch_error_fans_out_to_every_caller(self):
+        """Test that a failing batch_fn fails each request in the batch."""
+
+        # Arrange
+        async def fail(items):
+            raise RuntimeError("Model failed")
+
+        batcher = MicroBatcher(fail, max_wait_ms=50)
+        await batcher.start()
+
+        # Act
+        results = await asyncio.gather(
+            *(batcher.submit(i) for i in range(3)), return_exceptions=True
+        )
+        await batcher.stop()
+
+        # Assert
+        assert len(results) == 3
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert all(str(r) == "Model failed" for r in results)
+
+    @pytest.mark.asyncio
+    async def test_result_count_mismatch_fails_the_batch(self):
+        """Test that batch_fn must return one result per item."""
+
+        # Arrange
+        async def short(items):
+            return items[:-1]
+
+        batcher = MicroBatcher(short, max_wait_ms=50)
+        await batcher.start()
+
+        # Act & Assert
+        with pytest.raises(RuntimeError, match="expected 2 results, got 1"):
+            await asyncio.gather(batcher.submit(1), batcher.submit(2))
+        await batcher.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_fails_in_flight_requests(self):
+        """Test that stopping mid-batch doesn't leave callers waiting."""
+        # Arrange
+        started = asyncio.Event()
+
+        async def hang(items):
+            started.set()
+            await asyncio.sleep(60)
+
+        batcher = MicroBatcher(hang, max_wait_ms=1)
+        await batcher.start()
+        pending = asyncio.create_task(batcher.submit("item"))
+        await started.wait()
+
+        # Act
+        await batcher.stop()
+
+        # Assert
+        with pytest.raises(RuntimeError, match="shutting down"):
+            await asyncio.wait_for(pending, timeout=1)
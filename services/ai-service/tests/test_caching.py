@@ -0,0 +1,159 @@
+import numpy as np
+import pytest
+
+from app.core.caching import (
+    cache_embeddings,
+    get_cached_similar,
+    invalidate_similar,
+    set_cached_similar,
+)
+
+
+class FakeRedis:
+    """In-memory stand-in for the async Redis commands the caches use."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    async def hset(self, key, field, value):
+        self.data.setdefault(key, {})[field] = value
+
+    async def sadd(self, key, member):
+        self.data.setdefault(key, set()).add(str(member).encode())
+
+    async def smembers(self, key):
+        return self.data.get(key, set())
+
+    async def expire(self, key, ttl):
+        pass
+
+    async def hdel(self, key, field):
+        self.data.get(key, {}).pop(field, None)
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Queues FakeRedis commands and runs them in order on execute()."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((getattr(self.redis, name), args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        results = []
+        for command, args, kwargs in self.commands:
+            results.append(await command(*args, **kwargs))
+        return results
+
+
+def listing(listing_id):
+    return {"listing_id": listing_id, "similarity_score": 0.9}
+
+
+async def cache_similar(cache, listing_id, limit, listings):
+    _, epoch = await get_cached_similar(cache, listing_id, limit)
+    await set_cached_similar(cache, listing_id, limit, listings, epoch)
+
+
+async def cached_similar(cache, listing_id, limit):
+    listings, _ = await get_cached_similar(cache, listing_id, limit)
+    return listings
+
+
+class TestEmbeddingCache:
+    """Test suite for cache_embeddings."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_text_skips_encoder(self):
+        """Test that a cached query embedding is served as float16."""
+        # Arrange
+        calls = []
+
+        async def embed(text):
+            calls.append(text)
+            return [0.5, 0.25]
+
+        cached_embed = cache_embeddings(FakeRedis())(embed)
+
+        # Act
+        first = await cached_embed("calculus textbook")
+        second = await cached_embed("calculus textbook")
+
+        # Assert
+        assert calls == ["calculus textbook"]
+        assert second.dtype == np.float16
+        np.testing.assert_array_equal(first, second)
+
+
+class TestSimilarCache:
+    """Test suite for the similar-listings cache."""
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_results_containing_listing(self):
+        """Test that updating a listing clears others' cached neighbours."""
+        # Arrange
+        cache = FakeRedis()
+        await cache_similar(cache, 1, 10, [listing(2), listing(3)])
+        await cache_similar(cache, 4, 10, [listing(5)])
+
+        # Act
+        await invalidate_similar(cache, 2)
+
+        # Assert
+        assert await cached_similar(cache, 1, 10) is None
+        assert await cached_similar(cache, 4, 10) == [listing(5)]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_own_results(self):
+        """Test that updating a listing clears its own cached neighbours."""
+        # Arrange
+        cache = FakeRedis()
+        await cache_similar(cache, 1, 10, [listing(2)])
+        await cache_similar(cache, 1, 5, [listing(2)])
+
+        # Act
+        await invalidate_similar(cache, 1)
+
+        # Assert
+        assert await cached_similar(cache, 1, 10) is None
+        assert await cached_similar(cache, 1, 5) is None
+
+    @pytest.mark.asyncio
+    async def test_result_computed_before_invalidation_is_not_cached(self):
+        """Test that a result racing an invalidation isn't written back."""
+        # Arrange
+        cache = FakeRedis()
+        _, epoch = await get_cached_similar(cache, 1, 10)
+
+        # Act
+        await invalidate_similar(cache, 2)
+        await set_cached_similar(cache, 1, 10, [listing(2)], epoch)
+
+        # Assert
+        assert await cached_similar(cache, 1, 10) is None
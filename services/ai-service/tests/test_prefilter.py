@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import pytest
+
+import app.core.prefilter as prefilter
+from app.core.prefilter import PatternPrefilter, load_patterns
+from app.core.runtime_config import RuntimeSettings
+
+CONFIGS_DIR = Path(__file__).parent.parent / "configs"
+SHIPPED_PATTERNS = CONFIGS_DIR / "moderation_patterns.tsv"
+
+PATTERNS = [
+    ("spam", r"\bwire\s+transfer\s+only\b"),
+    ("off_platform_contact", r"\btelegram\s+me\b"),
+]
+
+
+@pytest.fixture(params=["hyperscan", "re"])
+def scanner(request, monkeypatch):
+    """Prefilter compiled with Hyperscan, and with the re fallback."""
+    if request.param == "hyperscan":
+        pytest.importorskip("hyperscan")
+    else:
+        monkeypatch.setattr(prefilter, "hyperscan", None)
+    return PatternPrefilter(PATTERNS)
+
+
+class TestPatternPrefilter:
+    """Test suite for PatternPrefilter."""
+
+    def test_scan_reports_matching_categories(self, scanner):
+        """Test that every matching pattern's category is reported."""
+        # Act
+        categories = scanner.scan("Payment by Wire Transfer only, telegram me")
+
+        # Assert
+        assert categories == ["off_platform_contact", "spam"]
+
+    def test_scan_passes_clean_text(self, scanner):
+        """Test that text matching no pattern is passed to the model."""
+        # Act & Assert
+        assert scanner.scan("Calculus textbook, lightly used") == []
+
+    def test_fallback_uses_re(self, monkeypatch):
+        """Test that the re fallback is used without Hyperscan."""
+        # Arrange
+        monkeypatch.setattr(prefilter, "hyperscan", None)
+
+        # Act
+        scanner = PatternPrefilter(PATTERNS)
+
+        # Assert
+        assert scanner._database is None
+        assert scanner._regex is not None
+
+    def test_no_patterns_matches_nothing(self):
+        """Test that an empty pattern set never flags text."""
+        # Act & Assert
+        assert PatternPrefilter([]).scan("wire transfer only") == []
+
+
+class TestLoadPatterns:
+    """Test suite for load_patterns."""
+
+    def test_skips_comments_and_blanks(self, tmp_path):
+        """Test parsing of category<TAB>regex lines."""
+        # Arrange
+        path = tmp_path / "patterns.tsv"
+        path.write_text("# header\n\nspam\t\\bfree money\\b\n")
+
+        # Act & Assert
+        assert load_patterns(str(path)) == [("spam", r"\bfree money\b")]
+
+    def test_rejects_malformed_line(self, tmp_path):
+        """Test that a line without a tab is reported with its line number."""
+        # Arrange
+        path = tmp_path / "patterns.tsv"
+        path.write_text("spam free money\n")
+
+        # Act & Assert
+        with pytest.raises(ValueError, match=":1: expected"):
+            load_patterns(str(path))
+
+    def test_shipped_pattern_file_is_empty(self):
+        """Test that no auto-reject policy ships without review."""
+        # Act & Assert
+        assert load_patterns(str(SHIPPED_PATTERNS)) == []
+
+    def test_unset_path_disables_prefilter(self):
+        """Test that an empty path yields no patterns."""
+        # Act & Assert
+        assert load_patterns(None) == []
+
+    def test_configured_path_enables_prefilter(self, tmp_path, monkeypatch):
+        """Test that MODERATION_PATTERNS_PATH from the environment loads."""
+        # Arrange
+        path = tmp_path / "patterns.tsv"
+        path.write_text("spam\t\\bwire\\s+transfer\\s+only\\b\n")
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("MODERATION_PATTERNS_PATH", str(path))
+
+        # Act
+        settings = RuntimeSettings()
+        patterns = load_patterns(settings.MODERATION_PATTERNS_PATH)
+        scanner = PatternPrefilter(patterns)
+
+        # Assert
+        assert scanner.scan("Wire transfer only please") == ["spam"]
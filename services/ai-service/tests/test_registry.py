@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from app.models.registry import LazyModel, ModelRegistry
+
+
+class CountingLoader:
+    """Async loader that records how often it runs."""
+
+    def __init__(self, model="model"):
+        self.model = model
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.model
+
+
+class TestLazyModel:
+    """Test suite for LazyModel."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_get_loads_once(self):
+        """Test that concurrent first requests share a single load."""
+        # Arrange
+        loader = CountingLoader()
+        lazy = LazyModel("embedding", loader)
+
+        # Act
+        models = await asyncio.gather(*(lazy.get() for _ in range(10)))
+
+        # Assert
+        assert models == ["model"] * 10
+        assert loader.calls == 1
+        assert lazy.loaded
+
+    @pytest.mark.asyncio
+    async def test_loader_returning_none_runs_once(self):
+        """Test that a loader returning nothing (load_models) runs once."""
+        # Arrange
+        loader = CountingLoader(model=None)
+        lazy = LazyModel("all", loader)
+
+        # Act
+        await lazy.get()
+        await lazy.get()
+
+        # Assert
+        assert loader.calls == 1
+        assert lazy.loaded
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_retried(self):
+        """Test that a failed load leaves the model unloaded for a retry."""
+        # Arrange
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("Download failed")
+            return "model"
+
+        lazy = LazyModel("moderation", flaky)
+
+        # Act
+        with pytest.raises(RuntimeError, match="Download failed"):
+            await lazy.get()
+        model = await lazy.get()
+
+        # Assert
+        assert model == "model"
+        assert len(attempts) == 2
+
+
+class TestModelRegistry:
+    """Test suite for ModelRegistry."""
+
+    @pytest.mark.asyncio
+    async def test_preload_loads_only_named_models(self):
+        """Test that unlisted models stay unloaded until first use."""
+        # Arrange
+        loaders = {name: CountingLoader(name) for name in ("a", "b", "c")}
+        registry = ModelRegistry(loaders)
+
+        # Act
+        await registry.preload(["a", "b"])
+
+        # Assert
+        assert registry.all_loaded(["a", "b"])
+        assert not registry.all_loaded(["c"])
+        assert loaders["c"].calls == 0
+        assert await registry["c"].get() == "c"
+
+    @pytest.mark.asyncio
+    async def test_preload_rejects_unknown_names(self):
+        """Test that a typo in PRELOAD_MODELS fails with the valid names."""
+        # Arrange
+        loaders = {"embedding": CountingLoader()}
+        registry = ModelRegistry(loaders)
+
+        # Act & Assert
+        message = r"\['embeding'\].*\['embedding'\]"
+        with pytest.raises(ValueError, match=message):
+            await registry.preload(["embeding"])
+        assert loaders["embedding"].calls == 0
@@ -0,0 +1,87 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from app.core.runtime_config import RuntimeSettings
+
+ENV_EXAMPLE = Path(__file__).parent.parent / "configs" / ".env.example"
+
+
+class TestRuntimeSettings:
+    """Test suite for RuntimeSettings."""
+
+    @pytest.fixture(autouse=True)
+    def isolated(self, tmp_path, monkeypatch):
+        """Run each test away from any real .env file."""
+        monkeypatch.chdir(tmp_path)
+
+    def test_defaults(self):
+        """Test the defaults with nothing configured."""
+        # Act
+        settings = RuntimeSettings()
+
+        # Assert
+        assert settings.WORKERS == 0
+        assert settings.MODERATION_BATCH_SIZE == 32
+        assert settings.MODERATION_QUANTIZE is True
+        assert settings.MODERATION_PATTERNS_PATH is None
+        assert settings.preload_models == ["embedding", "moderation"]
+
+    def test_environment_values_are_typed(self, monkeypatch):
+        """Test that string env values parse to their declared types."""
+        # Arrange
+        monkeypatch.setenv("MODERATION_QUANTIZE", "false")
+        monkeypatch.setenv("MODERATION_BATCH_SIZE", "16")
+        monkeypatch.setenv("MICRO_BATCH_MAX_WAIT_MS", "2.5")
+        monkeypatch.setenv("PRELOAD_MODELS", " embedding , ")
+
+        # Act
+        settings = RuntimeSettings()
+
+        # Assert
+        assert settings.MODERATION_QUANTIZE is False
+        assert settings.MODERATION_BATCH_SIZE == 16
+        assert settings.MICRO_BATCH_MAX_WAIT_MS == 2.5
+        assert settings.preload_models == ["embedding"]
+
+    def test_env_example_copy_loads(self, tmp_path):
+        """Test that a .env copied from .env.example (by setup.sh) loads."""
+        # Arrange
+        (tmp_path / "configs").mkdir()
+        (tmp_path / "configs" / ".env").write_text(
+            "PORT=8084\n"
+            "WORKERS=4  # uvicorn worker processes\n"
+            "MODERATION_QUANTIZE=false\n"
+        )
+
+        # Act
+        settings = RuntimeSettings()
+
+        # Assert
+        assert settings.WORKERS == 4
+        assert settings.MODERATION_QUANTIZE is False
+
+    def test_shipped_env_example_parses(self, tmp_path):
+        """Test that every documented knob in .env.example is read."""
+        # Arrange
+        (tmp_path / "configs").mkdir()
+        shutil.copy(ENV_EXAMPLE, tmp_path / "configs" / ".env")
+
+        # Act
+        settings = RuntimeSettings()
+
+        # Assert
+        assert settings.MICRO_BATCH_MAX_SIZE == 8
+        assert settings.MODERATION_PATTERNS_PATH == (
+            "./configs/moderation_patterns.tsv"
+        )
+
+    def test_rejects_invalid_batch_size(self, monkeypatch):
+        """Test that a non-positive batch size fails at startup."""
+        # Arrange
+        monkeypatch.setenv("MODERATION_BATCH_SIZE", "0")
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            RuntimeSettings()